@@ -1,89 +1,304 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Blueprint, render_template, request, jsonify, session
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
+import sys
 import json
-from datetime import datetime
+import zlib
+import atexit
+import signal
 import threading
 import time
-from database import Database
-from log_analyzer import LogAnalyzer
-from email_notifier import EmailNotifier
+from tiered_storage import create_storage
 from config_manager import ConfigManager
 
-app = Flask(__name__)
-app.secret_key = os.urandom(24)
-CORS(app)
+COMPONENTS = ('monitoring', 'ingest', 'scan', 'archive')
 
-db = Database()
-config_manager = ConfigManager()
+core = Blueprint('core', __name__)
+monitoring = Blueprint('monitoring', __name__)
+ingest = Blueprint('ingest', __name__)
+scan = Blueprint('scan', __name__)
+archive = Blueprint('archive', __name__)
+
+config_manager = None
+db = None
 log_analyzer = None
-monitoring_thread = None
-monitoring_active = False
+log_ingestor = None
+ingestor_lock = threading.Lock()
+
+
+def create_app(components=None):
+    global config_manager, db
+
+    if components is None:
+        env_components = os.environ.get('PYLOPI_COMPONENTS')
+        if env_components is None:
+            components = COMPONENTS
+        else:
+            components = [component.strip() for component in env_components.split(',') if component.strip()]
+
+    app = Flask(__name__)
+    app.secret_key = os.urandom(24)
+    CORS(app)
+
+    config_manager = ConfigManager()
+    config_manager.start_watching(config_manager.get('config_watch_interval', 2))
+    db = create_storage(config_manager.get_config())
+
+    app.register_blueprint(core)
+    blueprints = {'monitoring': monitoring, 'ingest': ingest, 'scan': scan, 'archive': archive}
+    for component in components:
+        if component not in blueprints:
+            raise ValueError(f'Unknown component: {component}')
+        app.register_blueprint(blueprints[component])
+
+    handle_sigterm()
 
+    if 'ingest' in components:
+        get_ingestor()
 
-@app.route('/')
+    if 'archive' in components:
+        threading.Thread(target=archive_loop, daemon=True).start()
+
+    return app
+
+
+@core.route('/')
 def index():
     lang = session.get('language', 'en')
     return render_template('index.html', lang=lang)
 
 
-@app.route('/api/language', methods=['POST'])
+@core.route('/api/language', methods=['POST'])
 def set_language():
     data = request.json
     session['language'] = data.get('language', 'en')
     return jsonify({'status': 'success'})
 
 
-@app.route('/api/config', methods=['GET', 'POST'])
+@core.route('/api/config', methods=['GET', 'POST'])
 def handle_config():
     if request.method == 'GET':
         config = config_manager.get_config()
         return jsonify(config)
     else:
-        data = request.json
-        config_manager.update_config(data)
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'status': 'error', 'message': 'Request body must be a JSON object'}), 400
+        try:
+            config_manager.update_config(data)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
         return jsonify({'status': 'success'})
 
 
-@app.route('/api/start-monitoring', methods=['POST'])
+@monitoring.route('/api/start-monitoring', methods=['POST'])
 def start_monitoring():
-    global log_analyzer, monitoring_thread, monitoring_active
-
     data = request.json
     log_paths = data.get('log_paths', [])
 
     if not log_paths:
         return jsonify({'status': 'error', 'message': 'No log paths provided'})
 
-    config = config_manager.get_config()
-    log_analyzer = LogAnalyzer(db, config)
-
-    monitoring_active = True
-    monitoring_thread = threading.Thread(
-        target=monitor_logs,
-        args=(log_paths, log_analyzer),
-        daemon=True
-    )
-    monitoring_thread.start()
+    ingestor = get_ingestor()
+    current = [source['path'] for source in ingestor.get_sources()]
+    ingestor.remove_sources([path for path in current if path not in log_paths])
+    ingestor.add_sources(log_paths)
 
     return jsonify({'status': 'success'})
 
 
-@app.route('/api/stop-monitoring', methods=['POST'])
+@monitoring.route('/api/stop-monitoring', methods=['POST'])
 def stop_monitoring():
-    global monitoring_active
-    monitoring_active = False
+    if log_ingestor is not None:
+        log_ingestor.remove_sources([source['path'] for source in log_ingestor.get_sources()])
     return jsonify({'status': 'success'})
 
 
-@app.route('/api/logs', methods=['GET'])
+@monitoring.route('/api/sources', methods=['GET', 'POST', 'DELETE'])
+def handle_sources():
+    if request.method == 'GET':
+        if log_ingestor is None:
+            return jsonify([])
+        return jsonify(log_ingestor.get_sources())
+
+    data = request.json
+    log_paths = data.get('log_paths', [])
+
+    if not log_paths:
+        return jsonify({'status': 'error', 'message': 'No log paths provided'}), 400
+
+    if request.method == 'POST':
+        added = get_ingestor().add_sources(log_paths)
+        return jsonify({'status': 'success', 'added': added})
+    elif log_ingestor is None:
+        return jsonify({'status': 'error', 'message': 'Monitoring is not running'}), 400
+    else:
+        removed = log_ingestor.remove_sources(log_paths)
+        return jsonify({'status': 'success', 'removed': removed})
+
+
+def create_ingestor(log_paths):
+    global log_analyzer, log_ingestor
+    from log_analyzer import LogAnalyzer
+    from log_ingestor import LogIngestor
+
+    config = config_manager.get_view()
+    log_analyzer = LogAnalyzer(db, config)
+    log_ingestor = LogIngestor(log_analyzer, db, config)
+    config_manager.subscribe(log_analyzer.apply_config)
+    config_manager.subscribe(log_ingestor.apply_config)
+    log_ingestor.start(log_paths)
+    atexit.register(log_ingestor.stop)
+
+
+def handle_sigterm():
+    if threading.current_thread() is not threading.main_thread():
+        return
+    if signal.getsignal(signal.SIGTERM) == signal.SIG_DFL:
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+
+def get_ingestor():
+    with ingestor_lock:
+        if log_ingestor is None:
+            create_ingestor([])
+        return log_ingestor
+
+
+def read_request_body(max_bytes):
+    if request.content_length is not None and request.content_length > max_bytes:
+        raise RequestEntityTooLarge()
+
+    chunks = []
+    size = 0
+    while True:
+        chunk = request.stream.read(64 * 1024)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise RequestEntityTooLarge()
+        chunks.append(chunk)
+    body = b''.join(chunks)
+
+    if request.headers.get('Content-Encoding', '').lower() != 'gzip':
+        return body
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    data = decompressor.decompress(body, max_bytes)
+    if decompressor.unconsumed_tail:
+        raise RequestEntityTooLarge()
+    return data
+
+
+@ingest.route('/api/ingest', methods=['POST'])
+def ingest_lines():
+    max_bytes = config_manager.get('ingest_max_body_bytes', 16 * 1024 * 1024)
+    try:
+        data = json.loads(read_request_body(max_bytes))
+    except RequestEntityTooLarge:
+        message = f'Request body is larger than {max_bytes} bytes'
+        return jsonify({'status': 'error', 'message': message}), 413
+    except (ValueError, zlib.error) as e:
+        return jsonify({'status': 'error', 'message': f'Invalid request body: {e}'}), 400
+
+    if not isinstance(data, dict) or not isinstance(data.get('streams', []), list):
+        return jsonify({'status': 'error', 'message': 'Body must be an object with a streams list'}), 400
+
+    streams = []
+    for stream in data.get('streams', []):
+        if not isinstance(stream, dict) or not isinstance(stream.get('lines', []), list):
+            return jsonify({'status': 'error', 'message': 'Each stream must be an object with a lines list'}), 400
+        source = stream.get('source')
+        lines = [line for line in stream.get('lines', []) if isinstance(line, str) and line.strip()]
+        if not source or not isinstance(source, str):
+            return jsonify({'status': 'error', 'message': 'Each stream needs a source'}), 400
+        streams.append((source, lines))
+
+    if not streams:
+        return jsonify({'status': 'error', 'message': 'No streams provided'}), 400
+
+    try:
+        submitted = get_ingestor().submit_lines(streams)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 413
+    except TimeoutError as e:
+        response = jsonify({'status': 'error', 'message': str(e)})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+    if not submitted:
+        response = jsonify({'status': 'error', 'message': 'Ingest queue is full, slow down'})
+        response.headers['Retry-After'] = '1'
+        return response, 429
+
+    accepted = sum(len(lines) for _, lines in streams)
+    return jsonify({'status': 'accepted', 'accepted': accepted}), 202
+
+
+@scan.route('/api/scan-file', methods=['POST'])
+def scan_file():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'status': 'error', 'message': 'Request body must be a JSON object'}), 400
+    log_path = data.get('log_path')
+
+    if not log_path:
+        return jsonify({'status': 'error', 'message': 'No log path provided'}), 400
+    if not os.path.isfile(log_path):
+        return jsonify({'status': 'error', 'message': 'Log file not found'}), 404
+
+    try:
+        start = int(data.get('start', 0))
+        context = int(data.get('context', 2))
+        limit = int(data.get('limit', 100))
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'start, context and limit must be integers'}), 400
+    if start < 0 or context < 0 or limit < 1:
+        return jsonify({'status': 'error', 'message': 'start and context must be >= 0 and limit >= 1'}), 400
+
+    from log_analyzer import LogAnalyzer
+    from log_scanner import LogScanner
+
+    config = config_manager.get_view()
+    analyzer = LogAnalyzer(db, config)
+    scanner = LogScanner(analyzer.error_patterns)
+
+    limit = min(limit, config.get('scan_max_results', 1000))
+    context = min(context, config.get('scan_max_context', 20))
+    store = data.get('store', False)
+    lookup = data.get('lookup_solution', False)
+
+    matches, end = scanner.scan(log_path, start, context, limit)
+
+    results = []
+    for match in matches:
+        log_data = analyzer.process_log_line(match['line'], log_path, lookup_solution=lookup)
+        if not log_data:
+            continue
+        if store:
+            log_data['id'] = db.insert_log(log_data)
+        log_data.update(match)
+        results.append(log_data)
+
+    return jsonify({
+        'status': 'success',
+        'log_path': log_path,
+        'start': start,
+        'end': end,
+        'results': results
+    })
+
+
+@core.route('/api/logs', methods=['GET'])
 def get_logs():
     limit = request.args.get('limit', 50, type=int)
     logs = db.get_recent_logs(limit)
     return jsonify(logs)
 
 
-@app.route('/api/log/<int:log_id>', methods=['GET'])
+@core.route('/api/log/<int:log_id>', methods=['GET'])
 def get_log_detail(log_id):
     log = db.get_log_detail(log_id)
     if log:
@@ -91,35 +306,46 @@ def get_log_detail(log_id):
     return jsonify({'error': 'Log not found'}), 404
 
 
-@app.route('/api/stats', methods=['GET'])
+@core.route('/api/search', methods=['GET'])
+def search_logs():
+    logs = db.search_logs(
+        query=request.args.get('q'),
+        error_type=request.args.get('error_type'),
+        severity=request.args.get('severity'),
+        limit=request.args.get('limit', 50, type=int)
+    )
+    return jsonify(logs)
+
+
+@archive.route('/api/archive', methods=['POST'])
+def archive_logs():
+    archived = db.archive_old_logs()
+    return jsonify({'status': 'success', 'archived': archived})
+
+
+@core.route('/api/stats', methods=['GET'])
 def get_stats():
     stats = db.get_statistics()
+    if log_ingestor is not None:
+        stats['ingest'] = log_ingestor.get_stats()
     return jsonify(stats)
 
 
-def monitor_logs(log_paths, analyzer):
-    global monitoring_active
-    file_positions = {path: 0 for path in log_paths}
-
-    while monitoring_active:
-        for log_path in log_paths:
-            if not os.path.exists(log_path):
-                continue
-
-            try:
-                with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    f.seek(file_positions[log_path])
-                    new_lines = f.readlines()
-                    file_positions[log_path] = f.tell()
+def archive_loop():
+    while True:
+        time.sleep(config_manager.get('archive_interval', 3600))
+        try:
+            archived = db.archive_old_logs()
+            if archived:
+                print(f"Archived {archived} logs")
+        except Exception as e:
+            print(f"Error archiving logs: {e}")
 
-                    for line in new_lines:
-                        if line.strip():
-                            analyzer.analyze_log_line(line, log_path)
-            except Exception as e:
-                print(f"Error reading {log_path}: {e}")
 
-        time.sleep(2)
+def main():
+    app = create_app()
+    app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    main()
\ No newline at end of file
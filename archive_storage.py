@@ -0,0 +1,222 @@
+import gzip
+import json
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from database import LOG_COLUMNS
+from storage import ColdLogStorage
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class ArchiveStorage(ColdLogStorage):
+    def __init__(self, archive_dir='archive'):
+        self.archive_dir = archive_dir
+        self.manifest_path = os.path.join(archive_dir, 'manifest.json')
+        self.lock_path = os.path.join(archive_dir, '.lock')
+        self.lock = threading.Lock()
+        self.manifest = {}
+        self.manifest_stamp = None
+
+    def load_manifest(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r') as f:
+                return json.load(f)
+        return {}
+
+    def manifest_file_stamp(self):
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def get_manifest(self):
+        stamp = self.manifest_file_stamp()
+        with self.lock:
+            if stamp != self.manifest_stamp:
+                self.manifest = self.load_manifest() if stamp else {}
+                self.manifest_stamp = stamp
+            return self.manifest
+
+    @contextmanager
+    def file_lock(self):
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with open(self.lock_path, 'a+b') as f:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def write_atomic(self, path, data):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def chunk_name(self, day, seq):
+        return f'logs-{day}-{seq:06d}.json.gz'
+
+    def partitions(self):
+        return sorted(list(self.get_manifest()), reverse=True)
+
+    def chunks(self, day, info):
+        if 'chunks' in info:
+            return info['chunks']
+        # Partitions written before chunking are a single file per day
+        return [dict(info, seq=0, file=f'logs-{day}.json.gz')]
+
+    def read_chunk(self, chunk):
+        path = os.path.join(self.archive_dir, chunk['file'])
+        if not os.path.exists(path):
+            return {column: [] for column in LOG_COLUMNS}
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def chunk_rows(self, chunk):
+        columns = self.read_chunk(chunk)
+        for i in range(len(columns['id']) - 1, -1, -1):
+            yield {column: columns[column][i] for column in LOG_COLUMNS}
+
+    def chunk_stats(self, columns):
+        return {
+            'rows': len(columns['id']),
+            'min_id': min(columns['id']),
+            'max_id': max(columns['id']),
+            'error_types': dict(Counter(columns['error_type'])),
+            'severities': dict(Counter(columns['severity']))
+        }
+
+    def day_stats(self, chunks):
+        error_types = Counter()
+        severities = Counter()
+        for chunk in chunks:
+            error_types.update(chunk['error_types'])
+            severities.update(chunk['severities'])
+        return {
+            'rows': sum(chunk['rows'] for chunk in chunks),
+            'min_id': min(chunk['min_id'] for chunk in chunks),
+            'max_id': max(chunk['max_id'] for chunk in chunks),
+            'error_types': dict(error_types),
+            'severities': dict(severities),
+            'chunks': chunks
+        }
+
+    def new_rows(self, chunks, rows):
+        low = min(row['id'] for row in rows)
+        high = max(row['id'] for row in rows)
+
+        known_ids = set()
+        for chunk in chunks:
+            if chunk['min_id'] <= high and chunk['max_id'] >= low:
+                known_ids.update(self.read_chunk(chunk)['id'])
+        return [row for row in rows if row['id'] not in known_ids]
+
+    def append_rows(self, rows):
+        by_day = {}
+        for row in rows:
+            by_day.setdefault(row['timestamp'][:10], []).append(row)
+
+        with self.lock, self.file_lock():
+            manifest = self.load_manifest()
+            for day, day_rows in by_day.items():
+                chunks = list(self.chunks(day, manifest[day])) if day in manifest else []
+                day_rows = self.new_rows(chunks, day_rows)
+                if not day_rows:
+                    continue
+
+                columns = {column: [row[column] for row in day_rows] for column in LOG_COLUMNS}
+                seq = max((chunk['seq'] for chunk in chunks), default=0) + 1
+                name = self.chunk_name(day, seq)
+
+                data = json.dumps(columns, separators=(',', ':')).encode('utf-8')
+                self.write_atomic(os.path.join(self.archive_dir, name), gzip.compress(data))
+
+                chunk = self.chunk_stats(columns)
+                chunk.update(seq=seq, file=name)
+                manifest[day] = self.day_stats(chunks + [chunk])
+
+            self.write_atomic(self.manifest_path, json.dumps(manifest, indent=4).encode('utf-8'))
+            self.manifest = manifest
+            self.manifest_stamp = self.manifest_file_stamp()
+
+    def get_log_detail(self, log_id):
+        for day, info in list(self.get_manifest().items()):
+            if not info['min_id'] <= log_id <= info['max_id']:
+                continue
+            for chunk in self.chunks(day, info):
+                if not chunk['min_id'] <= log_id <= chunk['max_id']:
+                    continue
+                for row in self.chunk_rows(chunk):
+                    if row['id'] == log_id:
+                        return row
+        return None
+
+    def search_logs(self, query=None, error_type=None, severity=None, limit=50):
+        query = query.lower() if query else None
+        manifest = self.get_manifest()
+        results = []
+        for day in self.partitions():
+            info = manifest.get(day)
+            if info is None:
+                continue
+
+            for chunk in reversed(self.chunks(day, info)):
+                if error_type and error_type not in chunk['error_types']:
+                    continue
+                if severity and severity not in chunk['severities']:
+                    continue
+
+                for row in self.chunk_rows(chunk):
+                    if error_type and row['error_type'] != error_type:
+                        continue
+                    if severity and row['severity'] != severity:
+                        continue
+                    if query and query not in row['error_message'].lower() and query not in row['full_log'].lower():
+                        continue
+
+                    results.append(self.summarize(row))
+                    if len(results) >= limit:
+                        return results
+        return results
+
+    def summarize(self, row):
+        return {
+            'id': row['id'],
+            'timestamp': row['timestamp'],
+            'log_file': row['log_file'],
+            'error_type': row['error_type'],
+            'error_message': row['error_message'],
+            'short_analysis': (row['analysis'] or '')[:200],
+            'severity': row['severity'],
+            'status': row['status']
+        }
+
+    def total_rows(self):
+        return sum(info['rows'] for info in list(self.get_manifest().values()))
+
+    def count_by(self, key):
+        counts = Counter()
+        for info in list(self.get_manifest().values()):
+            counts.update(info[key])
+        return counts
+
+    def count_day(self, day):
+        info = self.get_manifest().get(day)
+        return info['rows'] if info else 0
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+DEFAULT_BUDGET_MS = 400
+
+LAZY_MODULES = ['requests', 'bs4', 'smtplib', 'email.mime.multipart', 'log_analyzer', 'log_ingestor']
+
+STARTUP_STATEMENT = (
+    'import time; start = time.perf_counter(); '
+    'import app; app.create_app(["scan"]); '
+    'print(time.perf_counter() - start)'
+)
+
+
+def measure_startup():
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=package_dir)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_STATEMENT],
+            capture_output=True,
+            text=True,
+            cwd=work_dir,
+            env=env
+        )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+
+    imported = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and 'cumulative' not in line:
+            imported.add(line.split('|')[2].strip())
+
+    return float(result.stdout.strip()) * 1000, imported
+
+
+def check_import_time(budget_ms=DEFAULT_BUDGET_MS):
+    startup_ms, imported = measure_startup()
+    eager = [name for name in LAZY_MODULES if name in imported]
+
+    print(f"Startup time: {startup_ms:.1f} ms (budget {budget_ms} ms)")
+    if eager:
+        print(f"Imported at startup but should be lazy: {', '.join(eager)}")
+
+    return startup_ms <= budget_ms and not eager
+
+
+if __name__ == "__main__":
+    budget_ms = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+
+    sys.exit(0 if check_import_time(budget_ms) else 1)
@@ -1,14 +1,54 @@
 import json
 import os
+import threading
+import time
+
+
+class ConfigView:
+    def __init__(self, config):
+        self.raw = dict(config)
+
+        enabled_errors = config.get('enabled_error_types') or []
+        if not isinstance(enabled_errors, list):
+            raise ValueError('enabled_error_types must be a list')
+        self.enabled_error_types = frozenset(enabled_errors)
+        self.all_errors_enabled = not enabled_errors
+        self.email_notifications = bool(config.get('email_notifications', False))
+
+        try:
+            self.monitoring_interval = float(config.get('monitoring_interval', 2))
+        except (TypeError, ValueError):
+            raise ValueError('monitoring_interval must be a number')
+        if not self.monitoring_interval > 0:
+            raise ValueError('monitoring_interval must be greater than 0')
+
+    def accepts_error(self, error_type):
+        return self.all_errors_enabled or error_type in self.enabled_error_types
+
+    def get(self, key, default=None):
+        return self.raw.get(key, default)
+
+    def __getitem__(self, key):
+        return self.raw[key]
 
 
 class ConfigManager:
     def __init__(self, config_file='config.json'):
         self.config_file = config_file
+        self.lock = threading.RLock()
+        self.subscribers = []
+        self.watch_thread = None
         self.config = self.load_config()
+        try:
+            self.view = ConfigView(self.config)
+        except ValueError as e:
+            print(f"Invalid config, using defaults: {e}")
+            self.config = self.default_config()
+            self.view = ConfigView(self.config)
+        self.mtime = self.file_mtime()
 
-    def load_config(self):
-        default_config = {
+    def default_config(self):
+        return {
             'language': 'en',
             'email_notifications': False,
             'email_address': '',
@@ -33,9 +73,39 @@ class ConfigManager:
             ],
             'log_retention_days': 30,
             'max_logs_per_file': 10000,
-            'monitoring_interval': 2
+            'monitoring_interval': 2,
+            'ingest_max_backoff': 60,
+            'ingest_queue_size': 10000,
+            'ingest_read_chunk_size': 1048576,
+            'ingest_analysis_workers': 4,
+            'ingest_io_threads': 32,
+            'ingest_analysis_threads': 4,
+            'ingest_backfill_scan': True,
+            'scan_max_results': 1000,
+            'scan_max_context': 20,
+            'ingest_batch_size': 500,
+            'ingest_shutdown_timeout': 10,
+            'ingest_max_body_bytes': 16777216,
+            'syslog_enabled': False,
+            'syslog_host': '0.0.0.0',
+            'syslog_udp_port': 5514,
+            'syslog_tcp_port': 5514,
+            'database_path': 'pylopi.db',
+            'archive_dir': 'archive',
+            'archive_after_days': 7,
+            'archive_interval': 3600,
+            'config_watch_interval': 2,
+            'overload_thresholds': [0.25, 0.5, 0.75, 0.9],
+            'overload_lag_bytes': 67108864,
+            'overload_sample_size': 20,
+            'overload_sample_window': 60,
+            'overload_full_log_chars': 200,
+            'overload_check_interval': 1
         }
 
+    def load_config(self):
+        default_config = self.default_config()
+
         if os.path.exists(self.config_file):
             try:
                 with open(self.config_file, 'r') as f:
@@ -46,10 +116,21 @@ class ConfigManager:
 
         return default_config
 
+    def file_mtime(self):
+        try:
+            return os.stat(self.config_file).st_mtime_ns
+        except OSError:
+            return None
+
     def save_config(self):
+        tmp_file = f'{self.config_file}.tmp'
         try:
-            with open(self.config_file, 'w') as f:
+            with open(tmp_file, 'w') as f:
                 json.dump(self.config, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.config_file)
+            self.mtime = self.file_mtime()
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
@@ -58,19 +139,90 @@ class ConfigManager:
     def get_config(self):
         return self.config.copy()
 
+    def get_view(self):
+        return self.view
+
     def update_config(self, updates):
-        self.config.update(updates)
-        return self.save_config()
+        with self.lock:
+            config = dict(self.config)
+            config.update(updates)
+            ConfigView(config)
+            self.config = config
+            saved = self.save_config()
+        self.notify()
+        return saved
 
     def get(self, key, default=None):
-        return self.config.get(key, default)
+        return self.view.get(key, default)
 
     def set(self, key, value):
-        self.config[key] = value
-        return self.save_config()
+        return self.update_config({key: value})
 
     def reset_to_defaults(self):
-        if os.path.exists(self.config_file):
-            os.remove(self.config_file)
-        self.config = self.load_config()
-        return self.save_config()
\ No newline at end of file
+        with self.lock:
+            if os.path.exists(self.config_file):
+                os.remove(self.config_file)
+            self.config = self.load_config()
+            saved = self.save_config()
+        self.notify()
+        return saved
+
+    def reload(self):
+        try:
+            with open(self.config_file, 'r') as f:
+                loaded_config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reloading config: {e}")
+            return False
+
+        with self.lock:
+            config = self.default_config()
+            self.mtime = self.file_mtime()
+            try:
+                config.update(loaded_config)
+                ConfigView(config)
+            except (TypeError, ValueError) as e:
+                print(f"Error reloading config: {e}")
+                return False
+            if config == self.config:
+                return False
+            self.config = config
+        self.notify()
+        return True
+
+    def subscribe(self, callback):
+        with self.lock:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+    def notify(self):
+        with self.lock:
+            self.view = ConfigView(self.config)
+            view = self.view
+            subscribers = list(self.subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(view)
+            except Exception as e:
+                print(f"Error in config subscriber: {e}")
+
+    def start_watching(self, interval=2):
+        if self.watch_thread is not None:
+            return
+        self.watch_thread = threading.Thread(target=self.watch_file, args=(interval,), daemon=True)
+        self.watch_thread.start()
+
+    def watch_file(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                mtime = self.file_mtime()
+                if mtime is not None and mtime != self.mtime:
+                    self.reload()
+            except Exception as e:
+                print(f"Error watching config: {e}")
\ No newline at end of file
@@ -2,22 +2,38 @@ import sqlite3
 import json
 from datetime import datetime
 import threading
+from storage import HotLogStorage
 
 
-class Database:
+LOG_COLUMNS = [
+    'id', 'timestamp', 'log_file', 'error_type', 'error_message', 'full_log',
+    'analysis', 'solution', 'code_fix', 'severity', 'status'
+]
+
+
+class Database(HotLogStorage):
     def __init__(self, db_path='pylopi.db'):
         self.db_path = db_path
         self.lock = threading.Lock()
-        self.init_database()
+        self.init_lock = threading.Lock()
+        self.initialized = False
 
     def get_connection(self):
+        if not self.initialized:
+            self.init_database()
+        return self.connect()
+
+    def connect(self):
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
     def init_database(self):
-        with self.lock:
-            conn = self.get_connection()
+        with self.init_lock:
+            if self.initialized:
+                return
+
+            conn = self.connect()
             cursor = conn.cursor()
 
             cursor.execute('''
@@ -45,17 +61,24 @@ class Database:
 
             conn.commit()
             conn.close()
+            self.initialized = True
 
     def insert_log(self, log_data):
+        return self.insert_logs([log_data])[0]
+
+    def insert_logs(self, logs):
+        if not logs:
+            return []
+
         with self.lock:
             conn = self.get_connection()
             cursor = conn.cursor()
 
-            cursor.execute('''
+            cursor.executemany('''
                 INSERT INTO logs (log_file, error_type, error_message, full_log,
                                 analysis, solution, code_fix, severity)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            ''', [(
                 log_data['log_file'],
                 log_data['error_type'],
                 log_data['error_message'],
@@ -64,13 +87,14 @@ class Database:
                 log_data.get('solution', ''),
                 log_data.get('code_fix', ''),
                 log_data.get('severity', 'medium')
-            ))
+            ) for log_data in logs])
 
-            log_id = cursor.lastrowid
+            # AUTOINCREMENT ids are consecutive within one write transaction
+            last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
             conn.commit()
             conn.close()
 
-            return log_id
+            return list(range(last_id - len(logs) + 1, last_id + 1))
 
     def get_recent_logs(self, limit=50):
         conn = self.get_connection()
@@ -78,7 +102,7 @@ class Database:
 
         cursor.execute('''
             SELECT id, timestamp, log_file, error_type, error_message,
-                   LEFT(analysis, 200) as short_analysis, severity, status
+                   substr(analysis, 1, 200) as short_analysis, severity, status
             FROM logs
             ORDER BY timestamp DESC
             LIMIT ?
@@ -112,21 +136,42 @@ class Database:
         conn.close()
 
         if row:
-            return {
-                'id': row['id'],
-                'timestamp': row['timestamp'],
-                'log_file': row['log_file'],
-                'error_type': row['error_type'],
-                'error_message': row['error_message'],
-                'full_log': row['full_log'],
-                'analysis': row['analysis'],
-                'solution': row['solution'],
-                'code_fix': row['code_fix'],
-                'severity': row['severity'],
-                'status': row['status']
-            }
+            return dict(row)
         return None
 
+    def search_logs(self, query=None, error_type=None, severity=None, limit=50):
+        conditions = []
+        params = []
+
+        if query:
+            conditions.append('(error_message LIKE ? OR full_log LIKE ?)')
+            params.extend([f'%{query}%', f'%{query}%'])
+        if error_type:
+            conditions.append('error_type = ?')
+            params.append(error_type)
+        if severity:
+            conditions.append('severity = ?')
+            params.append(severity)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        params.append(limit)
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f'''
+            SELECT id, timestamp, log_file, error_type, error_message,
+                   substr(analysis, 1, 200) as short_analysis, severity, status
+            FROM logs
+            {where}
+            ORDER BY id DESC
+            LIMIT ?
+        ''', params)
+
+        logs = [dict(row) for row in cursor.fetchall()]
+        conn.close()
+        return logs
+
     def get_statistics(self):
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -166,6 +211,46 @@ class Database:
             'by_severity': by_severity
         }
 
+    def count_by(self, column):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f'''
+            SELECT {column} as value, COUNT(*) as count
+            FROM logs
+            GROUP BY {column}
+        ''')
+        counts = {row['value']: row['count'] for row in cursor.fetchall()}
+
+        conn.close()
+        return counts
+
+    def fetch_logs_before(self, days, after_id=0, limit=10000):
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f'''
+            SELECT {', '.join(LOG_COLUMNS)}
+            FROM logs
+            WHERE id > ? AND timestamp < datetime('now', ?)
+            ORDER BY id
+            LIMIT ?
+        ''', (after_id, f'-{days} days', limit))
+        rows = [dict(row) for row in cursor.fetchall()]
+
+        conn.close()
+        return rows
+
+    def delete_logs(self, log_ids):
+        with self.lock:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.executemany('DELETE FROM logs WHERE id = ?', [(log_id,) for log_id in log_ids])
+
+            conn.commit()
+            conn.close()
+
     def update_setting(self, key, value):
         with self.lock:
             conn = self.get_connection()
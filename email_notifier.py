@@ -1,6 +1,3 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 
 
@@ -19,6 +16,10 @@ class EmailNotifier:
             return
 
         try:
+            import smtplib
+            from email.mime.text import MIMEText
+            from email.mime.multipart import MIMEMultipart
+
             subject = f"PyLoPi Alert: {log_data['error_type']} detected"
 
             html_body = self.create_html_email(log_id, log_data)
@@ -1,15 +1,12 @@
 import re
-import requests
-from bs4 import BeautifulSoup
-import json
 from email_notifier import EmailNotifier
+from config_manager import ConfigView
 
 
 class LogAnalyzer:
     def __init__(self, database, config):
         self.db = database
-        self.config = config
-        self.email_notifier = EmailNotifier(config)
+        self.apply_config(config)
 
         self.error_patterns = {
             'SyntaxError': r'SyntaxError:(.+)',
@@ -34,19 +31,54 @@ class LogAnalyzer:
             'TimeoutError': r'timeout',
         }
 
+        combined = '|'.join(f'(?:{pattern})' for pattern in self.error_patterns.values())
+        self.prefilter = re.compile(combined, re.IGNORECASE)
+        self.matchers = [(error_type, re.compile(pattern, re.IGNORECASE))
+                         for error_type, pattern in self.error_patterns.items()]
+
+        self.severity_levels = {}
+        for severity, error_types in [
+            ('critical', ['500Error', 'DatabaseError', 'MemoryError', 'RecursionError']),
+            ('high', ['TypeError', 'AttributeError', 'ImportError', 'ConnectionError']),
+            ('medium', ['ValueError', 'KeyError', 'IndexError', '404Error']),
+            ('low', ['SyntaxError', 'NameError']),
+        ]:
+            for error_type in error_types:
+                self.severity_levels[error_type] = severity
+
+    def apply_config(self, config):
+        if not isinstance(config, ConfigView):
+            config = ConfigView(config)
+        self.config = config
+        self.email_notifier = EmailNotifier(config)
+
     def analyze_log_line(self, line, log_file):
+        log_data = self.process_log_line(line, log_file)
+
+        if not log_data:
+            return
+
+        log_id = self.db.insert_log(log_data)
+
+        if self.config.email_notifications:
+            self.email_notifier.send_notification(log_id, log_data)
+
+    def process_log_line(self, line, log_file, lookup_solution=True):
         detected_error = self.detect_error(line)
 
         if not detected_error:
-            return
+            return None
 
         error_type, error_message = detected_error
 
         if not self.should_process_error(error_type):
-            return
+            return None
 
         analysis = self.generate_analysis(error_type, error_message, line)
-        solution = self.search_solution(error_type, error_message)
+        if lookup_solution:
+            solution = self.search_solution(error_type, error_message)
+        else:
+            solution = self.get_default_solution(error_type)
         code_fix = self.generate_code_fix(error_type, error_message, line)
         severity = self.determine_severity(error_type)
 
@@ -61,24 +93,21 @@ class LogAnalyzer:
             'severity': severity
         }
 
-        log_id = self.db.insert_log(log_data)
-
-        if self.config.get('email_notifications', False):
-            self.email_notifier.send_notification(log_id, log_data)
+        return log_data
 
     def detect_error(self, line):
-        for error_type, pattern in self.error_patterns.items():
-            match = re.search(pattern, line, re.IGNORECASE)
+        if not self.prefilter.search(line):
+            return None
+
+        for error_type, matcher in self.matchers:
+            match = matcher.search(line)
             if match:
                 error_message = match.group(1) if match.groups() else match.group(0)
                 return error_type, error_message.strip()
         return None
 
     def should_process_error(self, error_type):
-        enabled_errors = self.config.get('enabled_error_types', [])
-        if not enabled_errors:
-            return True
-        return error_type in enabled_errors
+        return self.config.accepts_error(error_type)
 
     def generate_analysis(self, error_type, error_message, full_log):
         analyses = {
@@ -100,6 +129,9 @@ class LogAnalyzer:
         return analyses.get(error_type, f'Error detected: {error_type} - {error_message}')
 
     def search_solution(self, error_type, error_message):
+        import requests
+        from bs4 import BeautifulSoup
+
         try:
             query = f"{error_type} {error_message[:50]}"
             search_url = f"https://www.google.com/search?q={requests.utils.quote(query)}"
@@ -162,16 +194,4 @@ class LogAnalyzer:
         return fixes.get(error_type, '')
 
     def determine_severity(self, error_type):
-        critical = ['500Error', 'DatabaseError', 'MemoryError', 'RecursionError']
-        high = ['TypeError', 'AttributeError', 'ImportError', 'ConnectionError']
-        medium = ['ValueError', 'KeyError', 'IndexError', '404Error']
-        low = ['SyntaxError', 'NameError']
-
-        if error_type in critical:
-            return 'critical'
-        elif error_type in high:
-            return 'high'
-        elif error_type in medium:
-            return 'medium'
-        else:
-            return 'low'
\ No newline at end of file
+        return self.severity_levels.get(error_type, 'low')
@@ -0,0 +1,472 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from config_manager import ConfigView
+from log_scanner import LogScanner
+from overload_controller import (OverloadController, SHED_LOOKUP, SHED_NOTIFY,
+                                 SHED_FULL_LOG, SAMPLE, add_unsampled_counts)
+from storage import UNSAMPLED_COUNTS_KEY
+from syslog_receiver import start_syslog_servers
+
+
+class LogSource:
+    def __init__(self, path):
+        self.path = path
+        self.position = 0
+        self.failures = 0
+        self.backoff = 0
+        self.last_error = None
+        self.lines_read = 0
+        self.lag = 0
+        self.backfilling = True
+        self.task = None
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'position': self.position,
+            'lines_read': self.lines_read,
+            'lag_bytes': self.lag,
+            'failures': self.failures,
+            'backoff': self.backoff,
+            'last_error': self.last_error
+        }
+
+
+class LogIngestor:
+    def __init__(self, analyzer, database, config):
+        self.analyzer = analyzer
+        self.db = database
+        self.overload = OverloadController(config)
+        self.apply_config(config)
+
+        self.queue_size = config.get('ingest_queue_size', 10000)
+        self.analysis_workers = config.get('ingest_analysis_workers', 4)
+        self.scanner = LogScanner(analyzer.error_patterns)
+
+        self.sources = {}
+        self.lock = threading.Lock()
+        self.loop = None
+        self.thread = None
+        self.io_executor = None
+        self.analysis_executor = None
+        self.output_executor = None
+        self.ready = threading.Event()
+        self.running = False
+        self.syslog_servers = []
+
+        self.accepted_lines = 0
+        self.dropped_lines = 0
+        self.rejected_batches = 0
+
+    def apply_config(self, config):
+        if not isinstance(config, ConfigView):
+            config = ConfigView(config)
+        self.config = config
+        self.interval = config.monitoring_interval
+        self.max_backoff = config.get('ingest_max_backoff', 60)
+        self.read_chunk_size = config.get('ingest_read_chunk_size', 1024 * 1024)
+        self.batch_size = config.get('ingest_batch_size', 500)
+        self.backfill_scan = config.get('ingest_backfill_scan', True)
+        self.shutdown_timeout = config.get('ingest_shutdown_timeout', 10)
+        self.overload.apply_config(config)
+
+    def start(self, log_paths):
+        if self.running:
+            self.add_sources(log_paths)
+            return
+
+        self.running = True
+        self.ready.clear()
+        self.io_executor = ThreadPoolExecutor(
+            max_workers=self.config.get('ingest_io_threads', 32),
+            thread_name_prefix='pylopi-io'
+        )
+        self.analysis_executor = ThreadPoolExecutor(
+            max_workers=self.config.get('ingest_analysis_threads', self.analysis_workers),
+            thread_name_prefix='pylopi-analysis'
+        )
+        self.output_executor = ThreadPoolExecutor(
+            max_workers=2,
+            thread_name_prefix='pylopi-output'
+        )
+        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+        self.ready.wait()
+        self.add_sources(log_paths)
+
+    def stop(self):
+        if not self.running:
+            return
+
+        self.running = False
+        if self.loop is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self.loop)
+        if self.thread is not None:
+            self.thread.join(timeout=self.shutdown_timeout + 5)
+        for executor in (self.io_executor, self.analysis_executor, self.output_executor):
+            executor.shutdown(wait=False)
+
+    def add_sources(self, log_paths):
+        added = []
+        with self.lock:
+            for path in log_paths:
+                if path in self.sources:
+                    continue
+                self.sources[path] = LogSource(path)
+                added.append(path)
+
+        if self.loop is not None:
+            for path in added:
+                self.loop.call_soon_threadsafe(self._spawn_source, path)
+        return added
+
+    def remove_sources(self, log_paths):
+        removed = []
+        with self.lock:
+            for path in log_paths:
+                source = self.sources.pop(path, None)
+                if source is None:
+                    continue
+                removed.append(path)
+                if source.task is not None and self.loop is not None:
+                    self.loop.call_soon_threadsafe(source.task.cancel)
+        return removed
+
+    def get_sources(self):
+        with self.lock:
+            return [source.to_dict() for source in self.sources.values()]
+
+    def get_stats(self):
+        stats = {
+            'running': self.running,
+            'sources': len(self.sources),
+            'accepted_lines': self.accepted_lines,
+            'dropped_lines': self.dropped_lines,
+            'rejected_batches': self.rejected_batches,
+            'queue_capacity': self.queue_size,
+            'overload': self.overload.get_state()
+        }
+        if self.loop is not None:
+            stats['line_queue'] = self.line_queue.qsize()
+            stats['write_queue'] = self.write_queue.qsize()
+            stats['notify_queue'] = self.notify_queue.qsize()
+        return stats
+
+    def submit_lines(self, streams, timeout=5):
+        if self.loop is None:
+            return False
+        total = sum(len(lines) for _, lines in streams)
+        if total > self.queue_size:
+            raise ValueError(f'Batch of {total} lines is larger than the ingest queue ({self.queue_size})')
+
+        future = asyncio.run_coroutine_threadsafe(self._submit(streams), self.loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError('Ingest queue did not respond in time')
+
+    def offer_line(self, line, source):
+        try:
+            self.line_queue.put_nowait((line, source))
+        except asyncio.QueueFull:
+            return False
+        self.accepted_lines += 1
+        return True
+
+    async def put_line(self, line, source):
+        await self.line_queue.put((line, source))
+        self.accepted_lines += 1
+
+    async def _submit(self, streams):
+        total = sum(len(lines) for _, lines in streams)
+        if self.line_queue.maxsize - self.line_queue.qsize() < total:
+            self.rejected_batches += 1
+            return False
+
+        for source, lines in streams:
+            for line in lines:
+                self.line_queue.put_nowait((line, source))
+        self.accepted_lines += total
+        return True
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        self.line_queue = asyncio.Queue(maxsize=self.queue_size)
+        self.write_queue = asyncio.Queue(maxsize=self.queue_size)
+        self.notify_queue = asyncio.Queue(maxsize=self.queue_size)
+
+        self.workers = [self.loop.create_task(self._analysis_worker())
+                        for _ in range(self.analysis_workers)]
+        self.workers.append(self.loop.create_task(self._db_writer()))
+        self.workers.append(self.loop.create_task(self._notifier()))
+        self.workers.append(self.loop.create_task(self._overload_monitor()))
+
+        if self.config.get('syslog_enabled', False):
+            try:
+                self.syslog_servers = self.loop.run_until_complete(
+                    start_syslog_servers(self, self.config)
+                )
+            except OSError as e:
+                print(f"Failed to start syslog listener: {e}")
+
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+            self.loop = None
+
+    async def _shutdown(self):
+        with self.lock:
+            tasks = [source.task for source in self.sources.values() if source.task is not None]
+            for source in self.sources.values():
+                source.task = None
+
+        for server in self.syslog_servers:
+            server.close()
+        self.syslog_servers = []
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            await asyncio.wait_for(self._drain(), self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            pending = self.line_queue.qsize() + self.write_queue.qsize()
+            print(f"Ingest queues not drained after {self.shutdown_timeout}s, dropping {pending} items")
+
+        tasks = [task for task in asyncio.all_tasks(self.loop)
+                 if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        await self._run_in(None, self.analysis_executor.shutdown, True)
+        if self.overload.seen:
+            try:
+                results = await self._run_in(self.output_executor, self._flush_samples)
+                await self._run_in(self.output_executor, self.db.insert_logs, results)
+            except Exception as e:
+                print(f"Error flushing sampled logs: {e}")
+        self.loop.stop()
+
+    async def _drain(self):
+        await self.line_queue.join()
+        await self.write_queue.join()
+        await self.notify_queue.join()
+
+    async def _run_in(self, executor, func, *args):
+        try:
+            future = self.loop.run_in_executor(executor, func, *args)
+        except RuntimeError:
+            return func(*args)
+        return await future
+
+    def _spawn_source(self, path):
+        with self.lock:
+            source = self.sources.get(path)
+            if source is None or source.task is not None:
+                return
+            source.task = self.loop.create_task(self._watch_source(source))
+
+    async def _watch_source(self, source):
+        while self.running:
+            position = source.position
+            try:
+                lines = await self._run_in(self.io_executor, self._read_new_lines, source)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                source.failures += 1
+                source.last_error = str(e)
+                source.backoff = min(self.interval * (2 ** source.failures), self.max_backoff)
+                print(f"Error reading {source.path}: {e}")
+                await asyncio.sleep(source.backoff)
+                continue
+
+            source.failures = 0
+            source.backoff = 0
+
+            for line in lines:
+                if line.strip():
+                    await self.put_line(line, source.path)
+
+            if source.position == position:
+                await asyncio.sleep(self.interval)
+
+    def _read_new_lines(self, source):
+        if not os.path.exists(source.path):
+            source.position = 0
+            source.lag = 0
+            source.backfilling = True
+            return []
+
+        size = os.path.getsize(source.path)
+        if size < source.position:
+            source.position = 0
+            source.backfilling = True
+        source.lag = size - source.position
+        if size == source.position:
+            return []
+
+        if self.backfill_scan and source.backfilling:
+            matches, end = self.scanner.scan(
+                source.path, source.position, limit=self.batch_size, max_bytes=self.read_chunk_size
+            )
+            source.lines_read += self.scanner.count_lines(source.path, source.position, end)
+            source.position = end
+            source.lag = size - end
+            if len(matches) < self.batch_size and source.lag < self.read_chunk_size:
+                source.backfilling = False
+            return [match['line'] for match in matches]
+
+        with open(source.path, 'rb') as f:
+            f.seek(source.position)
+            data = f.read(self.read_chunk_size)
+
+        end = data.rfind(b'\n')
+        if end == -1:
+            if len(data) < self.read_chunk_size:
+                return []
+            end = len(data) - 1
+        data = data[:end + 1]
+        source.position += len(data)
+        source.lag = size - source.position
+
+        lines = data.decode('utf-8', errors='ignore').splitlines()
+        source.lines_read += len(lines)
+        return lines
+
+    async def _analysis_worker(self):
+        while True:
+            batch = [await self.line_queue.get()]
+            while len(batch) < self.batch_size and not self.line_queue.empty():
+                batch.append(self.line_queue.get_nowait())
+
+            try:
+                results = await self._run_in(self.analysis_executor, self._analyze_batch, batch)
+                for log_data in results:
+                    await self.write_queue.put(log_data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error analyzing batch: {e}")
+            finally:
+                for _ in batch:
+                    self.line_queue.task_done()
+
+    def _analyze_batch(self, batch):
+        level = self.overload.level
+        results = []
+        for line, log_file in batch:
+            try:
+                if level >= SAMPLE:
+                    self._sample_line(line, log_file)
+                    continue
+                log_data = self.analyzer.process_log_line(
+                    line, log_file, lookup_solution=level < SHED_LOOKUP
+                )
+            except Exception as e:
+                print(f"Error analyzing line from {log_file}: {e}")
+                continue
+            if log_data is not None:
+                if level >= SHED_LOOKUP:
+                    self.overload.record_shed('solution_lookup')
+                if level >= SHED_FULL_LOG:
+                    self._truncate_full_log(log_data)
+                results.append(log_data)
+        return results
+
+    def _sample_line(self, line, log_file):
+        detected_error = self.analyzer.detect_error(line)
+        if not detected_error:
+            return
+
+        error_type = detected_error[0]
+        if self.analyzer.should_process_error(error_type):
+            self.overload.offer_sample((line, log_file), error_type)
+
+    def _truncate_full_log(self, log_data):
+        if len(log_data['full_log']) > self.overload.full_log_chars:
+            log_data['full_log'] = log_data['full_log'][:self.overload.full_log_chars]
+            self.overload.record_shed('full_log')
+
+    def _flush_samples(self):
+        samples, unsampled = self.overload.take_samples()
+
+        if sum(unsampled.values()):
+            day = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+            counts = self.db.get_setting(UNSAMPLED_COUNTS_KEY)
+            counts = add_unsampled_counts(counts, unsampled, self.analyzer.determine_severity, day)
+            self.db.update_setting(UNSAMPLED_COUNTS_KEY, counts)
+
+        results = []
+        for line, log_file in samples:
+            log_data = self.analyzer.process_log_line(line, log_file, lookup_solution=False)
+            if log_data is not None:
+                self._truncate_full_log(log_data)
+                results.append(log_data)
+        return results
+
+    async def _overload_monitor(self):
+        while True:
+            await asyncio.sleep(self.config.get('overload_check_interval', 1))
+
+            queue_fill = max(self.line_queue.qsize(), self.write_queue.qsize()) / self.queue_size
+            with self.lock:
+                lag_bytes = sum(source.lag for source in self.sources.values())
+            level = self.overload.update(queue_fill, lag_bytes)
+
+            if self.overload.seen and (level < SAMPLE or self.overload.window_expired()):
+                try:
+                    results = await self._run_in(self.analysis_executor, self._flush_samples)
+                    for log_data in results:
+                        await self.write_queue.put(log_data)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"Error flushing sampled logs: {e}")
+
+    async def _db_writer(self):
+        while True:
+            batch = [await self.write_queue.get()]
+            while len(batch) < self.batch_size and not self.write_queue.empty():
+                batch.append(self.write_queue.get_nowait())
+
+            try:
+                log_ids = await self._run_in(self.output_executor, self.db.insert_logs, batch)
+                if self.analyzer.config.email_notifications:
+                    for log_id, log_data in zip(log_ids, batch):
+                        if self.overload.level >= SHED_NOTIFY:
+                            self.overload.record_shed('email')
+                        else:
+                            await self.notify_queue.put((log_id, log_data))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error storing {len(batch)} logs: {e}")
+            finally:
+                for _ in batch:
+                    self.write_queue.task_done()
+
+    async def _notifier(self):
+        while True:
+            log_id, log_data = await self.notify_queue.get()
+            try:
+                await self._run_in(
+                    self.output_executor, self.analyzer.email_notifier.send_notification, log_id, log_data
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error sending notification for log ID {log_id}: {e}")
+            finally:
+                self.notify_queue.task_done()
@@ -0,0 +1,79 @@
+import mmap
+import os
+import re
+
+
+class LogScanner:
+    def __init__(self, error_patterns):
+        combined = '|'.join(f'(?:{pattern})' for pattern in error_patterns.values())
+        self.prefilter = re.compile(combined.encode('utf-8'), re.IGNORECASE)
+
+    def scan(self, log_path, start=0, context=0, limit=None, max_bytes=None):
+        size = os.path.getsize(log_path)
+        if size <= start:
+            return [], start
+
+        with open(log_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                end = buf.rfind(b'\n', start) + 1
+                if end <= start:
+                    return [], start
+                if max_bytes and end - start > max_bytes:
+                    end = buf.rfind(b'\n', start, start + max_bytes) + 1
+                    if end <= start:
+                        end = buf.find(b'\n', start + max_bytes) + 1
+
+                matches = []
+                pos = start
+                while pos < end:
+                    match = self.prefilter.search(buf, pos, end)
+                    if not match:
+                        break
+
+                    line_start = buf.rfind(b'\n', start, match.start()) + 1
+                    if line_start == 0:
+                        line_start = start
+                    line_end = buf.find(b'\n', match.start(), end)
+
+                    matches.append({
+                        'offset': line_start,
+                        'length': line_end - line_start,
+                        'line': self.decode(buf[line_start:line_end]),
+                        'context_before': self.context_before(buf, line_start, context),
+                        'context_after': self.context_after(buf, line_end, end, context)
+                    })
+
+                    if limit and len(matches) >= limit:
+                        return matches, line_end + 1
+
+                    pos = line_end + 1
+
+        return matches, end
+
+    def count_lines(self, log_path, start, end):
+        with open(log_path, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start).count(b'\n')
+
+    def context_before(self, buf, line_start, count):
+        lines = []
+        end = line_start - 1
+        while count > 0 and end > 0:
+            start = buf.rfind(b'\n', 0, end) + 1
+            lines.insert(0, self.decode(buf[start:end]))
+            end = start - 1
+            count -= 1
+        return lines
+
+    def context_after(self, buf, line_end, limit, count):
+        lines = []
+        start = line_end + 1
+        while count > 0 and start < limit:
+            end = buf.find(b'\n', start, limit)
+            lines.append(self.decode(buf[start:end]))
+            start = end + 1
+            count -= 1
+        return lines
+
+    def decode(self, data):
+        return data.decode('utf-8', errors='ignore').rstrip('\r')
@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+from collections import Counter
+
+NORMAL = 0
+SHED_LOOKUP = 1
+SHED_NOTIFY = 2
+SHED_FULL_LOG = 3
+SAMPLE = 4
+
+LEVEL_NAMES = ['normal', 'shed_lookup', 'shed_notify', 'shed_full_log', 'sample']
+
+
+class OverloadController:
+    def __init__(self, config):
+        self.lock = threading.Lock()
+        self.level = NORMAL
+        self.pressure = 0.0
+        self.queue_fill = 0.0
+        self.lag_bytes = 0
+
+        self.shed_counts = Counter()
+        self.sampled = Counter()
+        self.seen = Counter()
+        self.reservoirs = {}
+        self.window_started = time.monotonic()
+
+        self.apply_config(config)
+
+    def apply_config(self, config):
+        self.thresholds = config.get('overload_thresholds', [0.25, 0.5, 0.75, 0.9])
+        self.lag_limit = config.get('overload_lag_bytes', 64 * 1024 * 1024)
+        self.sample_size = config.get('overload_sample_size', 20)
+        self.sample_window = config.get('overload_sample_window', 60)
+        self.full_log_chars = config.get('overload_full_log_chars', 200)
+
+    def update(self, queue_fill, lag_bytes):
+        pressure = max(queue_fill, lag_bytes / self.lag_limit if self.lag_limit else 0.0)
+
+        level = NORMAL
+        for i, threshold in enumerate(self.thresholds):
+            if pressure >= threshold:
+                level = min(i + 1, SAMPLE)
+
+        with self.lock:
+            self.queue_fill = queue_fill
+            self.lag_bytes = lag_bytes
+            self.pressure = pressure
+            if level > self.level:
+                self.level = level
+            elif level < self.level and pressure < self.thresholds[self.level - 1] / 2:
+                self.level = level
+
+        return self.level
+
+    def record_shed(self, work):
+        with self.lock:
+            self.shed_counts[work] += 1
+
+    def offer_sample(self, item, error_type):
+        with self.lock:
+            self.seen[error_type] += 1
+            reservoir = self.reservoirs.setdefault(error_type, [])
+
+            if len(reservoir) < self.sample_size:
+                reservoir.append(item)
+                return
+
+            index = random.randrange(self.seen[error_type])
+            if index < self.sample_size:
+                reservoir[index] = item
+
+    def window_expired(self):
+        return time.monotonic() - self.window_started >= self.sample_window
+
+    def take_samples(self):
+        with self.lock:
+            reservoirs = self.reservoirs
+            seen = self.seen
+            self.reservoirs = {}
+            self.seen = Counter()
+            self.window_started = time.monotonic()
+
+        samples = []
+        unsampled = Counter()
+        for error_type, reservoir in reservoirs.items():
+            samples.extend(reservoir)
+            unsampled[error_type] = seen[error_type] - len(reservoir)
+
+        with self.lock:
+            self.sampled.update({error_type: len(reservoir) for error_type, reservoir in reservoirs.items()})
+
+        return samples, unsampled
+
+    def get_state(self):
+        with self.lock:
+            return {
+                'level': self.level,
+                'mode': LEVEL_NAMES[self.level],
+                'pressure': round(self.pressure, 3),
+                'queue_fill': round(self.queue_fill, 3),
+                'lag_bytes': self.lag_bytes,
+                'shed': dict(self.shed_counts),
+                'sampled': dict(self.sampled),
+                'pending_samples': sum(self.seen.values())
+            }
+
+
+def add_unsampled_counts(counts, unsampled, severity_of, day):
+    counts = counts or {'error_types': {}, 'severities': {}, 'days': {}}
+
+    error_types = Counter(counts['error_types'])
+    error_types.update(unsampled)
+    counts['error_types'] = dict(error_types)
+
+    by_severity = Counter(counts['severities'])
+    for error_type, count in unsampled.items():
+        by_severity[severity_of(error_type)] += count
+    counts['severities'] = dict(by_severity)
+
+    days = Counter(counts['days'])
+    days[day] += sum(unsampled.values())
+    counts['days'] = dict(days)
+
+    return counts
@@ -0,0 +1,77 @@
+from abc import ABC, abstractmethod
+
+UNSAMPLED_COUNTS_KEY = 'unsampled_counts'
+
+
+class LogStorage(ABC):
+    @abstractmethod
+    def insert_log(self, log_data):
+        pass
+
+    @abstractmethod
+    def insert_logs(self, logs):
+        pass
+
+    @abstractmethod
+    def get_recent_logs(self, limit=50):
+        pass
+
+    @abstractmethod
+    def get_log_detail(self, log_id):
+        pass
+
+    @abstractmethod
+    def search_logs(self, query=None, error_type=None, severity=None, limit=50):
+        pass
+
+    @abstractmethod
+    def get_statistics(self):
+        pass
+
+    @abstractmethod
+    def update_setting(self, key, value):
+        pass
+
+    @abstractmethod
+    def get_setting(self, key, default=None):
+        pass
+
+
+class HotLogStorage(LogStorage):
+    @abstractmethod
+    def count_by(self, column):
+        pass
+
+    @abstractmethod
+    def fetch_logs_before(self, days, after_id=0, limit=10000):
+        pass
+
+    @abstractmethod
+    def delete_logs(self, log_ids):
+        pass
+
+
+class ColdLogStorage(ABC):
+    @abstractmethod
+    def append_rows(self, rows):
+        pass
+
+    @abstractmethod
+    def get_log_detail(self, log_id):
+        pass
+
+    @abstractmethod
+    def search_logs(self, query=None, error_type=None, severity=None, limit=50):
+        pass
+
+    @abstractmethod
+    def total_rows(self):
+        pass
+
+    @abstractmethod
+    def count_by(self, key):
+        pass
+
+    @abstractmethod
+    def count_day(self, day):
+        pass
@@ -0,0 +1,89 @@
+import asyncio
+import re
+
+
+RFC5424_PATTERN = re.compile(r'^1 \S+ (\S+) (\S+) \S+ \S+ (?:-|\[.*?\]) ?(.*)$')
+RFC3164_PATTERN = re.compile(r'^[A-Z][a-z]{2} [ \d]\d \d\d:\d\d:\d\d (\S+) ([^:\[\s]+)(?:\[\d+\])?: ?(.*)$')
+
+
+def parse_syslog_message(message, peer_host):
+    message = message.rstrip('\r\n')
+
+    if message.startswith('<'):
+        end = message.find('>')
+        if 0 < end <= 4:
+            message = message[end + 1:]
+
+    match = RFC5424_PATTERN.match(message) or RFC3164_PATTERN.match(message)
+    if match:
+        host, app_name, text = match.groups()
+        if host == '-':
+            host = peer_host
+        return f'syslog://{host}/{app_name}', text
+
+    return f'syslog://{peer_host}', message
+
+
+class SyslogUDPProtocol(asyncio.DatagramProtocol):
+    def __init__(self, ingestor):
+        self.ingestor = ingestor
+
+    def datagram_received(self, data, addr):
+        text = data.decode('utf-8', errors='ignore')
+        for message in text.splitlines():
+            if not message.strip():
+                continue
+            source, line = parse_syslog_message(message, addr[0])
+            if not self.ingestor.offer_line(line, source):
+                self.ingestor.dropped_lines += 1
+
+
+async def read_tcp_frames(reader):
+    while True:
+        first = await reader.read(1)
+        if not first:
+            return
+
+        if first.isdigit():
+            length = first + await reader.readuntil(b' ')
+            yield await reader.readexactly(int(length[:-1]))
+        else:
+            yield first + await reader.readuntil(b'\n')
+
+
+def make_tcp_handler(ingestor):
+    async def handle_client(reader, writer):
+        peer_host = writer.get_extra_info('peername')[0]
+        try:
+            async for frame in read_tcp_frames(reader):
+                message = frame.decode('utf-8', errors='ignore')
+                if not message.strip():
+                    continue
+                source, line = parse_syslog_message(message, peer_host)
+                await ingestor.put_line(line, source)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    return handle_client
+
+
+async def start_syslog_servers(ingestor, config):
+    host = config.get('syslog_host', '0.0.0.0')
+    servers = []
+
+    udp_port = config.get('syslog_udp_port', 5514)
+    if udp_port:
+        transport, _ = await ingestor.loop.create_datagram_endpoint(
+            lambda: SyslogUDPProtocol(ingestor),
+            local_addr=(host, udp_port)
+        )
+        servers.append(transport)
+
+    tcp_port = config.get('syslog_tcp_port', 5514)
+    if tcp_port:
+        server = await asyncio.start_server(make_tcp_handler(ingestor), host, tcp_port)
+        servers.append(server)
+
+    return servers
@@ -0,0 +1,84 @@
+from collections import Counter
+from datetime import datetime, timezone
+from storage import LogStorage, UNSAMPLED_COUNTS_KEY
+from database import Database
+from archive_storage import ArchiveStorage
+
+
+class TieredStorage(LogStorage):
+    def __init__(self, hot, cold, archive_after_days=7):
+        self.hot = hot
+        self.cold = cold
+        self.archive_after_days = archive_after_days
+
+    def insert_log(self, log_data):
+        return self.hot.insert_log(log_data)
+
+    def insert_logs(self, logs):
+        return self.hot.insert_logs(logs)
+
+    def get_recent_logs(self, limit=50):
+        logs = self.hot.get_recent_logs(limit)
+        if len(logs) < limit:
+            logs.extend(self.cold.search_logs(limit=limit - len(logs)))
+        return logs
+
+    def get_log_detail(self, log_id):
+        return self.hot.get_log_detail(log_id) or self.cold.get_log_detail(log_id)
+
+    def search_logs(self, query=None, error_type=None, severity=None, limit=50):
+        logs = self.hot.search_logs(query, error_type, severity, limit)
+        if len(logs) < limit:
+            logs.extend(self.cold.search_logs(query, error_type, severity, limit - len(logs)))
+        return logs
+
+    def get_statistics(self):
+        error_types = Counter(self.hot.count_by('error_type'))
+        error_types.update(self.cold.count_by('error_types'))
+
+        severities = Counter(self.hot.count_by('severity'))
+        severities.update(self.cold.count_by('severities'))
+
+        unsampled = self.hot.get_setting(UNSAMPLED_COUNTS_KEY) or {}
+        error_types.update(unsampled.get('error_types', {}))
+        severities.update(unsampled.get('severities', {}))
+        unsampled_total = sum(unsampled.get('error_types', {}).values())
+
+        hot_stats = self.hot.get_statistics()
+        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+        return {
+            'total_logs': hot_stats['total_logs'] + self.cold.total_rows() + unsampled_total,
+            'today_count': (hot_stats['today_count'] + self.cold.count_day(today)
+                            + unsampled.get('days', {}).get(today, 0)),
+            'top_errors': [{'error_type': error_type, 'count': count}
+                           for error_type, count in error_types.most_common(5)],
+            'by_severity': [{'severity': severity, 'count': count}
+                            for severity, count in severities.items()],
+            'hot_logs': hot_stats['total_logs'],
+            'archived_logs': self.cold.total_rows(),
+            'unsampled_logs': unsampled_total
+        }
+
+    def archive_old_logs(self, batch_size=10000):
+        archived = 0
+        while True:
+            rows = self.hot.fetch_logs_before(self.archive_after_days, limit=batch_size)
+            if not rows:
+                return archived
+
+            self.cold.append_rows(rows)
+            self.hot.delete_logs([row['id'] for row in rows])
+            archived += len(rows)
+
+    def update_setting(self, key, value):
+        self.hot.update_setting(key, value)
+
+    def get_setting(self, key, default=None):
+        return self.hot.get_setting(key, default)
+
+
+def create_storage(config):
+    database = Database(config.get('database_path', 'pylopi.db'))
+    archive = ArchiveStorage(config.get('archive_dir', 'archive'))
+    return TieredStorage(database, archive, config.get('archive_after_days', 7))